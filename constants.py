@@ -27,6 +27,26 @@ HEIGHT_THRESHOLD = HEIGHT - 160
 SCORE_TO_NEXT_LEVEL = 100
 LEVEL_TIMER = 30
 
+# Scalable mode runs fullscreen, scaled to the largest size that fits the
+# display. Set RESOLUTION to a (width, height) tuple to use a window of that
+# size instead. RESOLUTION is ignored unless SCALABLE is True.
+SCALABLE = False
+RESOLUTION = None
+
+# Gameplay telemetry, see telemetry.py
+TELEMETRY = False
+TELEMETRY_PATH = 'telemetry/telemetry.bin'
+TELEMETRY_BUFFER_RECORDS = 65536
+TELEMETRY_FLUSH_INTERVAL = 2.0
+TELEMETRY_MAX_FILE_BYTES = 8 * 1024 * 1024
+TELEMETRY_MAX_FILES = 4
+# Hot-path cost allowed per recorded event, checked by telemetry.py --bench
+TELEMETRY_BUDGET_NS = 500
+
+# Rewind practice mode, BACKSPACE jumps back REWIND_SECONDS
+REWIND = False
+REWIND_SECONDS = 5
+
 DEBUG = False
 
 
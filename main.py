@@ -1,7 +1,10 @@
 import sys
 import time
 import constants
+import scaling
+import snapshot
 import sprites
+import telemetry
 
 import pygame
 
@@ -13,7 +16,7 @@ class Game:
   def __init__(self):
     pygame.init()
     pygame.font.init()
-    self.screen = pygame.display.set_mode((constants.WIDTH, constants.HEIGHT))
+    self.screen = scaling.create_screen()
     pygame.display.set_caption(constants.TITLE)
     pygame.display.set_icon(pygame.image.load('assets/Apple60px.png'))
     self.clock = pygame.time.Clock()
@@ -21,18 +24,17 @@ class Game:
     self.lanes = utils.generate_lanes()
     self.game_state = constants.GameState.MAIN_MENU
 
-    self.background_image = pygame.image.load(
-        'assets/Background01.png').convert_alpha()
-    self.pause_image = pygame.image.load('assets/Pause.png').convert_alpha()
+    self.background_image = scaling.load_image('assets/Background01.png')
+    self.pause_image = scaling.load_image('assets/Pause.png')
 
     ### LABELS ###
     self.labels_background = pygame.Surface(
-        (constants.WIDTH, constants.TOP_MARGIN))
+        scaling.to_screen(constants.WIDTH, constants.TOP_MARGIN))
     self.bottom_black_bar = pygame.Surface(
-        (constants.WIDTH, constants.TOP_MARGIN))
+        scaling.to_screen(constants.WIDTH, constants.TOP_MARGIN))
 
     # Main menu
-    self.intro_image = pygame.image.load('assets/Intro.png').convert_alpha()
+    self.intro_image = scaling.load_image('assets/Intro.png')
 
     # In game
     self.level_label = sprites.UIElement(120, 20, 'LEVEL 01', constants.WHITE,
@@ -42,8 +44,7 @@ class Game:
                                          20)
 
     # Times up
-    self.times_up_image = pygame.image.load(
-        'assets/TimesUpB.png').convert_alpha()
+    self.times_up_image = scaling.load_image('assets/TimesUpB.png')
     self.highscore_label = sprites.UIElement(constants.WIDTH // 2, 395, '',
                                              constants.WHITE, 27)
 
@@ -57,6 +58,9 @@ class Game:
     self.apple_sound = sprites.Audio('assets/sounds/apple.wav')
     self.apple_sound.set_volume(0.3)
 
+    if constants.TELEMETRY:
+      telemetry.start()
+
     self.reset_properties()
 
   def new_game(self):
@@ -85,6 +89,9 @@ class Game:
     self.spawn_manager = sprites.SpawnManager(self.lanes)
     self.fruits = []
 
+    # Rewind
+    self.rewind_buffer = snapshot.RewindBuffer()
+
   def run(self):
     self.playing = True
     while self.playing:
@@ -98,6 +105,10 @@ class Game:
       self.current_level += 1
       self.current_level_score = 0
       self.level_label.update_text(f'LEVEL {self.current_level:02d}')
+      telemetry.record(
+          telemetry.LEVEL_UP, self.player.current_lane,
+          self.current_level - 1,
+          self.timer.total_seconds - self.timer.remaining_seconds)
       # Reset timer
       self.timer.reset()
 
@@ -114,6 +125,10 @@ class Game:
       self.current_time = time.time()
       # Reset cooldown timer
       if self.can_move():
+        if not self.player.can_move:
+          telemetry.record(telemetry.COOLDOWN_END,
+                           self.player.current_lane, self.current_level,
+                           self.current_time - self.last_move_time)
         self.move_cooldown = 0.0
         self.player.can_move = True
 
@@ -131,6 +146,9 @@ class Game:
             self.score += self.player.points
             self.current_level_score += self.player.points
             self.score_label.update_text(f'SCORE {self.score:04d}')
+            telemetry.record(telemetry.APPLE_CAUGHT,
+                             self.player.current_lane, self.current_level,
+                             self.current_time - fruit.spawn_time)
             self.update_level()
             self.apple_sound.play()
           else:
@@ -143,6 +161,9 @@ class Game:
               self.move_cooldown = 2.0
               self.player.can_move = False
               self.hit_sound.play()
+              telemetry.record(telemetry.WRONG_FRUIT,
+                               self.player.current_lane, self.current_level,
+                               self.move_cooldown)
           fruits_to_remove.append(fruit)
 
         # Remove fruits that are out of bounds with a margin
@@ -153,14 +174,26 @@ class Game:
       for fruit in fruits_to_remove:
         self.fruits.remove(fruit)
 
+      if constants.REWIND:
+        self.rewind_buffer.push(self)
+        if constants.DEBUG:
+          utils.debug_info['snapshot_us'] = round(
+              self.rewind_buffer.snapshot_time * 1e6, 1)
+          utils.debug_info['restore_us'] = round(
+              self.rewind_buffer.restore_time * 1e6, 1)
+          utils.debug_info['rewind_kb_per_s'] = round(
+              self.rewind_buffer.bytes_per_second() / 1024, 1)
+
   def draw(self):
     self.labels_background.fill(constants.BLACK)
     self.bottom_black_bar.fill(constants.BLACK)
-    self.screen.blit(self.background_image, (0, constants.TOP_MARGIN))
+    self.screen.blit(self.background_image,
+                     scaling.to_screen(0, constants.TOP_MARGIN))
 
     # MAIN MENU #
     if self.game_state == constants.GameState.MAIN_MENU:
-      self.screen.blit(self.intro_image, (0, constants.TOP_MARGIN))
+      self.screen.blit(self.intro_image,
+                       scaling.to_screen(0, constants.TOP_MARGIN))
 
     # IN GAME #
     elif (self.game_state == constants.GameState.IN_GAME or
@@ -175,17 +208,20 @@ class Game:
       self.timer_label.draw(self.labels_background)
       self.level_label.draw(self.labels_background)
       self.screen.blit(self.labels_background, (0, 0))
-      self.screen.blit(self.bottom_black_bar,
-                       (0, constants.HEIGHT - constants.TOP_MARGIN))
+      self.screen.blit(
+          self.bottom_black_bar,
+          scaling.to_screen(0, constants.HEIGHT - constants.TOP_MARGIN))
       # PAUSED #
       if self.game_state == constants.GameState.PAUSE:
-        self.screen.blit(self.pause_image, (0, constants.TOP_MARGIN))
+        self.screen.blit(self.pause_image,
+                         scaling.to_screen(0, constants.TOP_MARGIN))
 
     # GAME OVER #
     elif self.game_state == constants.GameState.GAME_OVER:
       self.times_up_sound.play()
       self.background_music.stop()
-      self.screen.blit(self.times_up_image, (0, constants.TOP_MARGIN))
+      self.screen.blit(self.times_up_image,
+                       scaling.to_screen(0, constants.TOP_MARGIN))
       self.highscore_label.update_text(f'SCORE {self.score:04d}')
       self.highscore_label.draw(self.screen)
 
@@ -193,8 +229,9 @@ class Game:
       utils.debug_info['speed'] = self.fruits[0].speed if self.fruits else 0
       utils.draw_info(utils.debug_info, self.screen)
       pygame.draw.line(self.screen, constants.WHITE,
-                       (0, constants.HEIGHT_THRESHOLD),
-                       (constants.WIDTH, constants.HEIGHT_THRESHOLD))
+                       scaling.to_screen(0, constants.HEIGHT_THRESHOLD),
+                       scaling.to_screen(constants.WIDTH,
+                                         constants.HEIGHT_THRESHOLD))
 
     pygame.display.flip()
 
@@ -204,6 +241,7 @@ class Game:
   def events(self):
     for event in pygame.event.get():
       if event.type == pygame.QUIT:
+        telemetry.stop()
         pygame.quit()
         sys.exit()
       if event.type == pygame.KEYDOWN:
@@ -217,21 +255,35 @@ class Game:
         # IN GAME #
         elif self.game_state == constants.GameState.IN_GAME:
           if self.can_move():
+            previous_lane = self.player.current_lane
             if event.key == pygame.K_LEFT:
               self.player.move_left()
             elif event.key == pygame.K_RIGHT:
               self.player.move_right()
             self.last_move_time = self.current_time
+            if self.player.current_lane != previous_lane:
+              telemetry.record(telemetry.LANE_CHANGE,
+                               self.player.current_lane, self.current_level)
+
+          if constants.REWIND and event.key == pygame.K_BACKSPACE:
+            self.rewind_buffer.rewind(self)
 
           if event.key == pygame.K_ESCAPE:
             self.background_music.pause()
             self.game_state = constants.GameState.PAUSE
+            self.pause_start_time = time.time()
 
         # PAUSED #
         elif self.game_state == constants.GameState.PAUSE:
           if event.key == pygame.K_ESCAPE:
             self.background_music.unpause()
             self.game_state = constants.GameState.IN_GAME
+            # Fruits and the move cooldown are frozen while paused, keep the
+            # pause out of the catch latency and the cooldown lost
+            paused_time = time.time() - self.pause_start_time
+            self.last_move_time += paused_time
+            for fruit in self.fruits:
+              fruit.spawn_time += paused_time
 
         # GAME OVER #
         elif self.game_state == constants.GameState.GAME_OVER:
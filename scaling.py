@@ -0,0 +1,86 @@
+import pygame
+
+import constants
+
+# Factor between logical coordinates (constants.WIDTH x constants.HEIGHT) and
+# screen pixels. Game logic, lanes and hitboxes always stay in logical
+# coordinates, only drawing goes through this module.
+scale = 1.0
+
+# Assets are resized once per scale factor and reused, so drawing at 4K costs
+# the same blits as drawing at the native resolution
+_image_cache: dict[tuple[str, float], pygame.Surface] = {}
+_font_cache: dict[tuple[str, int, float], pygame.font.Font] = {}
+# Logical (unscaled) size of every surface returned by load_image
+_logical_sizes: dict[pygame.Surface, tuple[int, int]] = {}
+
+
+def choose_scale(display_size: tuple[int, int]) -> float:
+  width, height = display_size
+  return min(width / constants.WIDTH, height / constants.HEIGHT)
+
+
+def create_screen() -> pygame.Surface:
+  """Open the display and return the surface the game draws on."""
+  global scale
+  if constants.SCALABLE and constants.RESOLUTION is None:
+    # Fill the whole display and letterbox the game area in the middle
+    display = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    scale = choose_scale(display.get_size())
+  else:
+    scale = (choose_scale(constants.RESOLUTION)
+             if constants.SCALABLE else 1.0)
+    display = pygame.display.set_mode(screen_size())
+
+  display.fill(constants.BLACK)
+  game_area = pygame.Rect((0, 0), screen_size())
+  game_area.center = display.get_rect().center
+  return display.subsurface(game_area)
+
+
+def screen_size() -> tuple[int, int]:
+  return to_screen(constants.WIDTH, constants.HEIGHT)
+
+
+def to_screen(x: float, y: float) -> tuple[int, int]:
+  return (round(x * scale), round(y * scale))
+
+
+def to_screen_rect(x: float, y: float, width: float,
+                   height: float) -> tuple[int, int, int, int]:
+  return (*to_screen(x, y), *to_screen(width, height))
+
+
+def to_logical(length: float) -> float:
+  return length / scale
+
+
+def load_image(file_path: str) -> pygame.Surface:
+  key = (file_path, scale)
+  if key not in _image_cache:
+    image = pygame.image.load(file_path).convert_alpha()
+    size = image.get_size()
+    if scale != 1.0:
+      image = pygame.transform.smoothscale(image, to_screen(*size))
+    _image_cache[key] = image
+    _logical_sizes[image] = size
+  return _image_cache[key]
+
+
+def logical_size(image: pygame.Surface) -> tuple[int, int]:
+  return _logical_sizes.get(image, image.get_size())
+
+
+def load_font(file_path: str, size: int) -> pygame.font.Font:
+  key = (file_path, size, scale)
+  if key not in _font_cache:
+    scaled_size = max(1, round(size * scale))
+    try:
+      font = pygame.font.Font(file_path, scaled_size)
+    except pygame.error:
+      print(
+          f"Could not load font file {file_path}. Falling back to system font.")
+      # Fallback to system font if custom font fails to load
+      font = pygame.font.SysFont("Consolas", scaled_size)
+    _font_cache[key] = font
+  return _font_cache[key]
@@ -0,0 +1,183 @@
+import collections
+import math
+import struct
+import sys
+import time
+from typing import Optional
+
+import constants
+import telemetry
+
+# level, score, current_level_score, move_cooldown, last_move_age,
+# player lane, player can_move,
+# timer remaining_seconds, timer last_tick_age, timer is_running,
+# apple_next_delay, apple_last_spawn_age, fruit_last_spawn_age,
+# fruit_spawned_last, last_lane_clear_age, occupied lanes bitmask, fruit count
+HEADER = struct.Struct('<HIIffB?Hf?fff?fBH')
+# lane, image (-1 for apples), y, speed, spawn_age
+FRUIT = struct.Struct('<Bbfff')
+# Mersenne Twister state (624 words + position) and the cached gauss value
+RNG = struct.Struct('<625Id')
+
+# Times are stored as ages relative to the moment the snapshot was taken, so
+# a restore continues from the same point no matter how long ago it was.
+# A snapshot is (capture time, state, serialised RNG).
+Snapshot = tuple[float, bytes, bytes]
+
+
+def take(game, rng: Optional[bytes] = None) -> Snapshot:
+  """Pass `rng` to reuse a serialised RNG state that has not changed."""
+  now = time.time()
+  player = game.player
+  timer = game.timer
+  spawn_manager = game.spawn_manager
+  lane_indices = spawn_manager.lane_indices
+
+  occupied_lanes = 0
+  for lane in spawn_manager.occupied_lanes:
+    occupied_lanes |= 1 << lane_indices[lane]
+
+  state = bytearray(HEADER.size + FRUIT.size * len(game.fruits))
+  HEADER.pack_into(
+      state,
+      0,
+      game.current_level,
+      game.score,
+      game.current_level_score,
+      game.move_cooldown,
+      now - game.last_move_time,
+      player.current_lane,
+      player.can_move,
+      timer.remaining_seconds,
+      now - timer.last_tick,
+      timer.is_running,
+      spawn_manager.apple_next_delay,
+      now - spawn_manager.apple_last_spawn,
+      now - spawn_manager.fruit_last_spawn,
+      spawn_manager.fruit_spawned_last,
+      now - spawn_manager.last_current_lane_clear,
+      occupied_lanes,
+      len(game.fruits),
+  )
+  offset = HEADER.size
+  for fruit in game.fruits:
+    image = (-1 if fruit.is_apple else
+             spawn_manager.fruit_images.index(fruit.image))
+    FRUIT.pack_into(state, offset, lane_indices[fruit.x], image, fruit.y,
+                    fruit.speed, now - fruit.spawn_time)
+    offset += FRUIT.size
+
+  if rng is None:
+    _, internal_state, gauss_next = spawn_manager.random.getstate()
+    rng = RNG.pack(*internal_state,
+                   math.nan if gauss_next is None else gauss_next)
+  return now, bytes(state), rng
+
+
+def restore(game, snapshot: Snapshot) -> None:
+  _, state, rng = snapshot
+  now = time.time()
+  player = game.player
+  timer = game.timer
+  spawn_manager = game.spawn_manager
+
+  (game.current_level, game.score, game.current_level_score,
+   game.move_cooldown, last_move_age, player.current_lane, player.can_move,
+   timer.remaining_seconds, last_tick_age, timer.is_running,
+   spawn_manager.apple_next_delay, apple_last_spawn_age, fruit_last_spawn_age,
+   spawn_manager.fruit_spawned_last, last_lane_clear_age, occupied_lanes,
+   _) = HEADER.unpack_from(state)
+
+  game.current_time = now
+  game.last_move_time = now - last_move_age
+  timer.last_tick = now - last_tick_age
+  spawn_manager.apple_last_spawn = now - apple_last_spawn_age
+  spawn_manager.fruit_last_spawn = now - fruit_last_spawn_age
+  spawn_manager.last_current_lane_clear = now - last_lane_clear_age
+  spawn_manager.occupied_lanes = [
+      lane[0]
+      for i, lane in enumerate(spawn_manager.lanes)
+      if occupied_lanes & (1 << i)
+  ]
+
+  game.fruits = []
+  for lane, image, y, speed, spawn_age in FRUIT.iter_unpack(
+      memoryview(state)[HEADER.size:]):
+    fruit = spawn_manager.create_fruit(
+        x=spawn_manager.lanes[lane][0],
+        image=(spawn_manager.apple_image
+               if image < 0 else spawn_manager.fruit_images[image]),
+        speed=speed,
+        is_apple=image < 0)
+    fruit.y = y
+    fruit.spawn_time = now - spawn_age
+    fruit.update_draw_position()
+    game.fruits.append(fruit)
+
+  *internal_state, gauss_next = RNG.unpack(rng)
+  if math.isnan(gauss_next):
+    gauss_next = None
+  spawn_manager.random.setstate((3, tuple(internal_state), gauss_next))
+  spawn_manager.random_draws += 1
+
+  player.update(game.lanes)
+  game.level_label.update_text(f'LEVEL {game.current_level:02d}')
+  game.score_label.update_text(f'SCORE {game.score:04d}')
+
+
+class RewindBuffer:
+
+  def __init__(self, seconds: float = constants.REWIND_SECONDS):
+    self.seconds = seconds
+    # Trimmed by capture time, so dropped frames do not stretch the history.
+    # clock.tick never runs faster than FPS, which bounds the length.
+    self.snapshots: collections.deque[Snapshot] = collections.deque(
+        maxlen=int(seconds * constants.FPS) + 1)
+    # Cost of the last push/rewind in seconds
+    self.snapshot_time = 0.0
+    self.restore_time = 0.0
+    # SpawnManager.random_draws when the newest RNG state was serialised
+    self.random_draws = -1
+
+  def push(self, game) -> None:
+    start_time = time.perf_counter()
+    # The RNG only moves when something spawns, share it between frames
+    random_draws = game.spawn_manager.random_draws
+    rng = None
+    if self.snapshots and random_draws == self.random_draws:
+      rng = self.snapshots[-1][2]
+    snapshot = take(game, rng)
+    self.snapshots.append(snapshot)
+    self.random_draws = random_draws
+    oldest_time = snapshot[0] - self.seconds
+    while self.snapshots[0][0] < oldest_time:
+      self.snapshots.popleft()
+    self.snapshot_time = time.perf_counter() - start_time
+
+  def rewind(self, game) -> bool:
+    """Jump back to the oldest snapshot in the buffer."""
+    if not self.snapshots:
+      return False
+    start_time = time.perf_counter()
+    seconds = time.time() - self.snapshots[0][0]
+    restore(game, self.snapshots[0])
+    self.snapshots.clear()
+    self.restore_time = time.perf_counter() - start_time
+    # Lets telemetry tell replayed catches and hits apart from new ones
+    telemetry.record(telemetry.REWIND, game.player.current_lane,
+                     game.current_level, seconds)
+    return True
+
+  def bytes_per_second(self) -> float:
+    """Memory held per second of history, including object overhead."""
+    if len(self.snapshots) < 2:
+      return 0.0
+    rng_sizes = {id(rng): sys.getsizeof(rng) for _, _, rng in self.snapshots}
+    # Each frame is a capture time float, a state bytes object, a tuple and a
+    # deque slot (a pointer)
+    total = sum(rng_sizes.values())
+    for snapshot in self.snapshots:
+      total += (sys.getsizeof(snapshot[0]) + sys.getsizeof(snapshot[1]) +
+                sys.getsizeof(snapshot) + 8)
+    covered_time = self.snapshots[-1][0] - self.snapshots[0][0]
+    return total / covered_time if covered_time > 0 else 0.0
@@ -3,6 +3,8 @@ import time
 from typing import Optional
 import pygame
 import constants
+import scaling
+import telemetry
 import utils
 
 
@@ -26,13 +28,14 @@ class Sprite:
   def draw(self, screen: pygame.Surface):
     draw_x, draw_y = (self.x - self.width // 2, self.y - self.height // 2)
     if self.image:
-      screen.blit(self.image, (draw_x, draw_y))
+      screen.blit(self.image, scaling.to_screen(draw_x, draw_y))
 
     if constants.DEBUG:
       # Draw hitboxes for debugging
       pygame.draw.rect(screen,
                        self.colour,
-                       (self.hitbox_x, self.hitbox_y, self.width, self.height),
+                       scaling.to_screen_rect(self.hitbox_x, self.hitbox_y,
+                                              self.width, self.height),
                        width=2)
 
   def collide(self, other: "Sprite") -> bool:
@@ -45,14 +48,14 @@ class Sprite:
 class Player(Sprite):
 
   def __init__(self):
-    self.newton_image = pygame.image.load('assets/Newton.png').convert_alpha()
-    self.newton_ouch_image = pygame.image.load(
-        'assets/Newton-Ouch.png').convert_alpha()
+    self.newton_image = scaling.load_image('assets/Newton.png')
+    self.newton_ouch_image = scaling.load_image('assets/Newton-Ouch.png')
+    width, height = scaling.logical_size(self.newton_image)
     Sprite.__init__(
         self,
         image=self.newton_image,
-        width=self.newton_image.get_width(),
-        height=self.newton_image.get_height(),
+        width=width,
+        height=height,
     )
     self.current_lane = 2
     self.points = 10
@@ -65,8 +68,7 @@ class Player(Sprite):
       self.image = self.newton_ouch_image
 
     if self.image:
-      self.width = self.image.get_width()
-      self.height = self.image.get_height()
+      self.width, self.height = scaling.logical_size(self.image)
 
   def update_draw_position(self):
     self.hitbox_x, self.hitbox_y = (
@@ -96,6 +98,7 @@ class Fruit(Sprite):
                is_apple=False):
     self.is_apple = is_apple
     self.speed = speed
+    self.spawn_time = time.time()
     self.width, self.height = width, height
     Sprite.__init__(
         self,
@@ -136,23 +139,16 @@ class UIElement:
     self.create_font()
 
   def create_font(self):
-    font_path = 'assets/Pixeled.ttf'
-    try:
-      font = pygame.font.Font(font_path, self.font_size)
-    except pygame.error:
-      print(
-          f"Could not load font file {font_path}. Falling back to system font.")
-      # Fallback to system font if custom font fails to load
-      font = pygame.font.SysFont("Consolas", self.font_size)
+    font = scaling.load_font('assets/Pixeled.ttf', self.font_size)
 
     self.original_surf = font.render(self.text, True, self.colour)
     self.text_surf = self.original_surf.copy()
     # this surface is used to adjust the alpha of the text_surf
     self.alpha_surf = pygame.Surface(self.text_surf.get_size(), pygame.SRCALPHA)
 
-    # Calculate center position
-    text_width = self.text_surf.get_width()
-    text_height = self.text_surf.get_height()
+    # Calculate center position in logical coordinates
+    text_width = scaling.to_logical(self.text_surf.get_width())
+    text_height = scaling.to_logical(self.text_surf.get_height())
     self.draw_x, self.draw_y = (self.x - text_width // 2,
                                 self.y - text_height // 2)
 
@@ -163,11 +159,12 @@ class UIElement:
     self.alpha_surf.fill((255, 255, 255, self.alpha))
     self.text_surf.blit(self.alpha_surf, (0, 0),
                         special_flags=pygame.BLEND_RGBA_MULT)
-    screen.blit(self.text_surf, (self.draw_x, self.draw_y))
+    screen.blit(self.text_surf, scaling.to_screen(self.draw_x, self.draw_y))
     if constants.DEBUG:
       pygame.draw.rect(screen,
                        constants.WHITE,
-                       (self.draw_x, self.draw_y, self.text_surf.get_width(),
+                       (*scaling.to_screen(self.draw_x, self.draw_y),
+                        self.text_surf.get_width(),
                         self.text_surf.get_height()),
                        width=2)
 
@@ -228,9 +225,15 @@ class SpawnManager:
 
   def __init__(self, lanes):
     self.lanes = lanes
+    # Lane index by x coordinate, used for telemetry
+    self.lane_indices = {lane[0]: i for i, lane in enumerate(lanes)}
+    # Own generator so the spawn sequence can be saved and restored, bumped
+    # on every use so snapshots know when its state changed
+    self.random = random.Random()
+    self.random_draws = 0
 
     # APPLE SPAWNS
-    self.apple_next_delay = random.uniform(1, 3)
+    self.apple_next_delay = self.random.uniform(1, 3)
     self.apple_last_spawn = time.time() - self.apple_next_delay
     self.apple_max_delay = 3.0
     self.apple_min_delay = 1.0
@@ -255,13 +258,13 @@ class SpawnManager:
     self.last_current_lane_clear = time.time()
 
     # Images
-    self.apple_image = pygame.image.load('assets/Apple60px.png').convert_alpha()
+    self.apple_image = scaling.load_image('assets/Apple60px.png')
     self.fruit_images = [
-        pygame.image.load('assets/Banana80px.png').convert_alpha(),
-        pygame.image.load('assets/Orange60px.png').convert_alpha(),
-        pygame.image.load('assets/Grapes-60px.png').convert_alpha(),
-        pygame.image.load('assets/Lemon60px.png').convert_alpha(),
-        pygame.image.load('assets/Strawberry60px.png').convert_alpha(),
+        scaling.load_image('assets/Banana80px.png'),
+        scaling.load_image('assets/Orange60px.png'),
+        scaling.load_image('assets/Grapes-60px.png'),
+        scaling.load_image('assets/Lemon60px.png'),
+        scaling.load_image('assets/Strawberry60px.png'),
     ]
 
   def calculate_apple_delay(self, level: int) -> float:
@@ -269,7 +272,8 @@ class SpawnManager:
     current_max_delay = max(
         self.apple_max_delay - (self.apple_delay_decrease_rate * (level - 1)),
         self.apple_min_possible_delay)
-    return random.uniform(self.apple_min_delay, current_max_delay)
+    self.random_draws += 1
+    return self.random.uniform(self.apple_min_delay, current_max_delay)
 
   def get_safe_lane(self, occupied_lanes: list) -> Optional[int]:
     # Only store the x coordinate of the lanes
@@ -279,15 +283,17 @@ class SpawnManager:
           lane for lane in available_lanes if lane not in occupied_lanes
       ]
     if available_lanes:
-      return random.choice(available_lanes)
+      self.random_draws += 1
+      return self.random.choice(available_lanes)
 
     return None
 
   def create_fruit(self, x, image, speed, is_apple) -> Fruit:
+    width, height = scaling.logical_size(image)
     return Fruit(
         x=x,
-        width=image.get_width(),
-        height=image.get_height(),
+        width=width,
+        height=height,
         image=image,
         speed=speed,
         is_apple=is_apple,
@@ -321,6 +327,8 @@ class SpawnManager:
                                   speed=speed,
                                   is_apple=True)
         new_fruits.append(apple)
+        telemetry.record(telemetry.APPLE_SPAWNED,
+                         self.lane_indices[lane], level)
 
       # Reset apple spawn timer and generate new delay
       self.apple_last_spawn = current_time
@@ -337,10 +345,11 @@ class SpawnManager:
       spawn_chance = self.fruit_base_spawn_chance + (
           self.fruit_chance_increase_per_level * (level - 1))
       spawn_chance = min(spawn_chance, self.fruit_max_spawn_chance)
-      if random.random() < spawn_chance or (not self.fruit_spawned_last and
-                                            level > 3):
+      self.random_draws += 1
+      if (self.random.random() < spawn_chance or
+          (not self.fruit_spawned_last and level > 3)):
         # Select random fruit image
-        fruit_image = random.choice(self.fruit_images)
+        fruit_image = self.random.choice(self.fruit_images)
 
         # Get safe lane (different from apple if apple was spawned)
         lane = self.get_safe_lane(self.occupied_lanes)
@@ -353,6 +362,8 @@ class SpawnManager:
                                     is_apple=False)
           new_fruits.append(fruit)
           self.fruit_spawned_last = True
+          telemetry.record(telemetry.FRUIT_SPAWNED,
+                           self.lane_indices[lane], level)
       else:
         self.fruit_spawned_last = False
 
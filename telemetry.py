@@ -0,0 +1,306 @@
+import argparse
+import atexit
+import enum
+import os
+import statistics
+import struct
+import threading
+import time
+from typing import Iterator, Optional
+
+import constants
+
+
+class Event(enum.IntEnum):
+  APPLE_SPAWNED = 1
+  FRUIT_SPAWNED = 2
+  APPLE_CAUGHT = 3  # value: seconds between spawn and catch
+  WRONG_FRUIT = 4  # value: cooldown applied
+  LANE_CHANGE = 5
+  COOLDOWN_END = 6  # value: seconds the player could not move
+  LEVEL_UP = 7  # value: seconds it took to finish the level
+  REWIND = 8  # value: seconds jumped back, later events replay that time
+
+
+_EVENTS = frozenset(Event)
+
+# Plain int codes for call sites, an enum attribute lookup costs more than
+# packing the record itself
+APPLE_SPAWNED = int(Event.APPLE_SPAWNED)
+FRUIT_SPAWNED = int(Event.FRUIT_SPAWNED)
+APPLE_CAUGHT = int(Event.APPLE_CAUGHT)
+WRONG_FRUIT = int(Event.WRONG_FRUIT)
+LANE_CHANGE = int(Event.LANE_CHANGE)
+COOLDOWN_END = int(Event.COOLDOWN_END)
+LEVEL_UP = int(Event.LEVEL_UP)
+REWIND = int(Event.REWIND)
+
+
+# timestamp, event, lane, level, value (16 bytes)
+RECORD = struct.Struct('<dBbHf')
+# Bound once so append() avoids attribute lookups on every event
+_pack_into = RECORD.pack_into
+_now = time.time
+
+
+class RingBuffer:
+  """Fixed-size records, one producer (the game loop) and one consumer.
+
+  The producer only moves `head` and the consumer only moves `tail`, so no
+  lock is needed on the hot path. When the writer falls behind, new records
+  are dropped and counted instead of blocking the game.
+  """
+
+  def __init__(self, capacity: int):
+    self.capacity = capacity
+    self.buffer = bytearray(capacity * RECORD.size)
+    self.head = 0
+    self.tail = 0
+    self.dropped = 0
+
+  def append(self,
+             event: int,
+             lane: int = -1,
+             level: int = 0,
+             value: float = 0.0) -> None:
+    head = self.head
+    if head - self.tail >= self.capacity:
+      self.dropped += 1
+      return
+    _pack_into(self.buffer, (head % self.capacity) * RECORD.size, _now(),
+               event, lane, level, value)
+    self.head = head + 1
+
+  def drain(self) -> bytes:
+    head, tail = self.head, self.tail
+    if head == tail:
+      return b''
+    start = (tail % self.capacity) * RECORD.size
+    end = (head % self.capacity) * RECORD.size
+    if start < end:
+      data = bytes(self.buffer[start:end])
+    else:
+      data = bytes(self.buffer[start:]) + bytes(self.buffer[:end])
+    self.tail = head
+    return data
+
+
+class Writer(threading.Thread):
+
+  def __init__(
+      self,
+      buffer: RingBuffer,
+      file_path: str = constants.TELEMETRY_PATH,
+      flush_interval: float = constants.TELEMETRY_FLUSH_INTERVAL,
+      max_file_bytes: int = constants.TELEMETRY_MAX_FILE_BYTES,
+      max_files: int = constants.TELEMETRY_MAX_FILES,
+  ):
+    threading.Thread.__init__(self, daemon=True)
+    self.buffer = buffer
+    self.file_path = file_path
+    self.flush_interval = flush_interval
+    self.max_file_bytes = max_file_bytes
+    self.max_files = max_files
+    self.stopping = threading.Event()
+    self.errors = 0
+
+  def run(self):
+    while not self.stopping.wait(self.flush_interval):
+      self.try_flush()
+    self.try_flush()
+
+  def try_flush(self):
+    # A failed write loses that batch but the writer keeps draining, otherwise
+    # the ring would fill up and drop every later event
+    try:
+      self.flush()
+    except OSError as error:
+      if not self.errors:
+        print(f'Could not write telemetry to {self.file_path}: {error}')
+      self.errors += 1
+
+  def stop(self):
+    self.stopping.set()
+    self.join()
+
+  def flush(self):
+    data = self.buffer.drain()
+    if not data:
+      return
+    directory = os.path.dirname(self.file_path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    with open(self.file_path, 'ab') as file:
+      file.write(data)
+      size = file.tell()
+    if size >= self.max_file_bytes:
+      self.rotate()
+
+  def rotate(self):
+    # telemetry.bin -> telemetry.bin.1 -> ... -> telemetry.bin.<max_files - 1>
+    # The oldest file is dropped, so disk usage stays under
+    # max_files * max_file_bytes (plus one flush)
+    oldest = f'{self.file_path}.{self.max_files - 1}'
+    if os.path.exists(oldest):
+      os.remove(oldest)
+    for i in range(self.max_files - 2, 0, -1):
+      if os.path.exists(f'{self.file_path}.{i}'):
+        os.replace(f'{self.file_path}.{i}', f'{self.file_path}.{i + 1}')
+    if self.max_files > 1:
+      os.replace(self.file_path, f'{self.file_path}.1')
+    else:
+      os.remove(self.file_path)
+
+
+_buffer: Optional[RingBuffer] = None
+_writer: Optional[Writer] = None
+
+
+def start() -> None:
+  global _buffer, _writer
+  if _buffer is not None:
+    return
+  _buffer = RingBuffer(constants.TELEMETRY_BUFFER_RECORDS)
+  _writer = Writer(_buffer)
+  _writer.start()
+  _set_recorder(_buffer.append)
+  # Flush whatever is left however the game exits
+  atexit.register(stop)
+
+
+def stop() -> None:
+  global _buffer, _writer
+  _set_recorder(_ignore)
+  if _writer is not None:
+    _writer.stop()
+  _buffer, _writer = None, None
+
+
+def _ignore(event: int, lane: int = -1, level: int = 0,
+            value: float = 0.0) -> None:
+  pass
+
+
+# record(event, lane, level, value) is the buffer's append while telemetry
+# runs, so the hot path is a single call
+record = _ignore
+
+
+def _set_recorder(recorder) -> None:
+  global record
+  record = recorder
+
+
+def log_files(file_path: str = constants.TELEMETRY_PATH) -> list[str]:
+  """All rotated log files, oldest first."""
+  paths = [
+      f'{file_path}.{i}'
+      for i in range(constants.TELEMETRY_MAX_FILES - 1, 0, -1)
+  ]
+  paths.append(file_path)
+  return [path for path in paths if os.path.exists(path)]
+
+
+def read_records(file_path: str,
+                 chunk_records: int = 4096) -> Iterator[tuple]:
+  # Read a chunk at a time so large logs never have to fit in memory
+  with open(file_path, 'rb') as file:
+    while True:
+      chunk = file.read(chunk_records * RECORD.size)
+      # Ignore a partially written record at the end of the file
+      chunk = chunk[:len(chunk) - len(chunk) % RECORD.size]
+      if not chunk:
+        break
+      yield from RECORD.iter_unpack(chunk)
+
+
+def aggregate(file_paths: list[str]) -> dict:
+  counts = {event: 0 for event in Event}
+  catch_latency_total = 0.0
+  catch_latency_max = 0.0
+  cooldown_lost = 0.0
+  level_times = {}
+  for file_path in file_paths:
+    for _, event, _, level, value in read_records(file_path):
+      if event not in _EVENTS:
+        continue
+      event = Event(event)
+      counts[event] += 1
+      if event == Event.APPLE_CAUGHT:
+        catch_latency_total += value
+        catch_latency_max = max(catch_latency_max, value)
+      elif event == Event.COOLDOWN_END:
+        cooldown_lost += value
+      elif event == Event.LEVEL_UP:
+        total, runs = level_times.get(level, (0.0, 0))
+        level_times[level] = (total + value, runs + 1)
+
+  caught = counts[Event.APPLE_CAUGHT]
+  return {
+      'events': {event.name.lower(): count for event, count in counts.items()},
+      # Events after a rewind replay time that was already recorded
+      'rewinds': counts[Event.REWIND],
+      'catch_latency_avg': catch_latency_total / caught if caught else 0.0,
+      'catch_latency_max': catch_latency_max,
+      'cooldown_lost': cooldown_lost,
+      'level_time_avg': {
+          level: total / runs for level, (total, runs) in sorted(
+              level_times.items())
+      },
+  }
+
+
+def benchmark(events: int = 1_000_000) -> float:
+  """Return the hot-path cost of record() in nanoseconds per event.
+
+  Only the record() calls are timed, minus the cost of the bare loop. The
+  median over batches is reported so one slow batch does not skew it.
+  """
+  global _buffer
+  previous, previous_record = _buffer, record
+  _buffer = RingBuffer(constants.TELEMETRY_BUFFER_RECORDS)
+  _set_recorder(_buffer.append)
+  batch = constants.TELEMETRY_BUFFER_RECORDS
+  costs = []
+  try:
+    for _ in range(max(events // batch, 1)):
+      start_time = time.perf_counter_ns()
+      for _ in range(batch):
+        record(LANE_CHANGE, 2, 1, 0.0)
+      record_time = time.perf_counter_ns() - start_time
+      _buffer.drain()
+      start_time = time.perf_counter_ns()
+      for _ in range(batch):
+        pass
+      loop_time = time.perf_counter_ns() - start_time
+      costs.append((record_time - loop_time) / batch)
+    return statistics.median(costs)
+  finally:
+    _buffer = previous
+    _set_recorder(previous_record)
+
+
+if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description='Summarise telemetry logs.')
+  parser.add_argument('files', nargs='*', help='log files, oldest first')
+  parser.add_argument('--bench',
+                      action='store_true',
+                      help='measure the cost of recording an event')
+  args = parser.parse_args()
+
+  if args.bench:
+    cost = benchmark()
+    budget = constants.TELEMETRY_BUDGET_NS
+    print(f'record(): {cost:.0f} ns per event, budget {budget} ns: '
+          f'{"ok" if cost <= budget else "OVER BUDGET"}')
+    if cost > budget:
+      raise SystemExit(1)
+  else:
+    file_paths = []
+    for file_path in args.files or log_files():
+      if os.path.isfile(file_path):
+        file_paths.append(file_path)
+      else:
+        print(f'Skipping {file_path}: no such file')
+    for key, value in aggregate(file_paths).items():
+      print(key, ':', value)